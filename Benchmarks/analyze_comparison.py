@@ -3,225 +3,442 @@
 Real performance comparison analysis between NLopt and C# implementation
 """
 
+import argparse
 import csv
-import re
 import json
+import os
+import re
 from pathlib import Path
-import matplotlib.pyplot as plt
 import numpy as np
 from typing import Dict, List, Tuple
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# One row of the C# "Performance Analysis Report" results table
+_ROW_RE = re.compile(r'^(\w+)\s+(Ours \(\w+\)|\w+ \(\w+\))\s+([\d.]+)\s+(\d+)\s+(\d+)\s+([\d.E+-]+)\s+(\w+)\s*$')
+
+# Column layouts of the parsed results, one array per field
+_NLOPT_DTYPES = {
+    'time_ms': np.float64,
+    'func_evals': np.int64,
+    'final_value': str,
+    'param_error': np.float64,
+    'converged': bool,
+    'algorithm': str
+}
+_CSHARP_DTYPES = {
+    'time_ms': np.float64,
+    'func_evals': np.int64,
+    'iterations': np.int64,
+    'param_error': np.float64,
+    'converged': bool,
+    'implementation': str
+}
+
+
+def _to_columns(col_lists: Dict, dtypes: Dict) -> Dict[str, np.ndarray]:
+    """Convert per-column lists into typed NumPy arrays"""
+    return {k: np.asarray(col_lists.get(k, []), dtype=dt) for k, dt in dtypes.items()}
+
+
+def _append_row(names: List, col_lists: Dict, rows: Dict, name: str, values: Dict):
+    """Append one parsed row to the column lists; a repeated name replaces its earlier row"""
+    i = rows.get(name)
+    if i is None:
+        rows[name] = len(names)
+        names.append(name)
+        for k, v in values.items():
+            col_lists[k].append(v)
+    else:
+        for k, v in values.items():
+            col_lists[k][i] = v
+
+
+def _merge_columns(names: np.ndarray, cols: Dict[str, np.ndarray],
+                   new_names: np.ndarray, new_cols: Dict[str, np.ndarray], dtypes: Dict):
+    """Merge new rows into existing columns like dict.update: a repeated name
+    overwrites its row in place and new names are appended"""
+    if not names.size:
+        return new_names, new_cols
+    merged_names = names.tolist()
+    col_lists = {k: v.tolist() for k, v in cols.items()}
+    rows = {name: i for i, name in enumerate(merged_names)}
+    new_lists = {k: v.tolist() for k, v in new_cols.items()}
+    for i, name in enumerate(new_names.tolist()):
+        _append_row(merged_names, col_lists, rows, name, {k: new_lists[k][i] for k in dtypes})
+    return np.asarray(merged_names, dtype=str), _to_columns(col_lists, dtypes)
+
+
+def _source_stamp(source_stat: os.stat_result) -> Dict[str, int]:
+    """Identify one version of a source file for cache validation"""
+    return {'mtime_ns': source_stat.st_mtime_ns, 'size': source_stat.st_size}
+
+
+def _load_cache(source_file: str, source_stat: os.stat_result, dtypes: Dict):
+    """Return (names, columns) cached next to source_file, or None if stale/missing"""
+    cache = Path(source_file + ".cache.json")
+    try:
+        data = cache.read_bytes()
+    except OSError:
+        return None
+    try:
+        cached = orjson.loads(data) if orjson is not None else json.loads(data)
+    except ValueError:
+        # NaN/inf caches are written by stdlib json, which orjson cannot read
+        try:
+            cached = json.loads(data)
+        except ValueError:
+            return None
+    # Only trust a cache written for exactly this version of the source; a
+    # newer cache is not enough since cp -p/git checkout can restore old mtimes
+    if not isinstance(cached, dict) or cached.keys() != {'source', 'names', 'cols'}:
+        return None
+    if cached['source'] != _source_stamp(source_stat):
+        return None
+    names, cols = cached['names'], cached['cols']
+    if not isinstance(names, list) or not isinstance(cols, dict) or cols.keys() != dtypes.keys():
+        return None
+    if any(not isinstance(v, list) or len(v) != len(names) for v in cols.values()):
+        return None
+    return np.asarray(names, dtype=str), _to_columns(cols, dtypes)
+
+
+def _save_cache(source_file: str, source_stat: os.stat_result,
+                names: np.ndarray, cols: Dict[str, np.ndarray]):
+    """Cache parsed columns next to source_file; failures are ignored"""
+    results = {
+        'source': _source_stamp(source_stat),
+        'names': names.tolist(),
+        'cols': {k: v.tolist() for k, v in cols.items()}
+    }
+    # orjson writes NaN/inf as null, so only use it when every float is finite
+    finite = all(np.isfinite(v).all() for v in cols.values() if v.dtype == np.float64)
+    if orjson is not None and finite:
+        data = orjson.dumps(results)
+    else:
+        data = json.dumps(results).encode()
+    try:
+        Path(source_file + ".cache.json").write_bytes(data)
+    except OSError:
+        pass
+
 class PerformanceAnalyzer:
+    # Results are stored column-wise: *_names[i] labels row i of every
+    # array in *_cols. C# names are "<test>_Standard" / "<test>_Optimized".
+    __slots__ = (
+        'nlopt_names', 'nlopt_cols', 'csharp_names', 'csharp_cols',
+        'common_std', 'common_opt', '_std_rows', '_opt_rows'
+    )
+    
     def __init__(self):
-        self.nlopt_results = {}
-        self.csharp_results = {}
+        self.nlopt_names = np.array([], dtype=str)
+        self.nlopt_cols = _to_columns({}, _NLOPT_DTYPES)
+        self.csharp_names = np.array([], dtype=str)
+        self.csharp_cols = _to_columns({}, _CSHARP_DTYPES)
+        self._pair_results()
         
     def parse_nlopt_csv(self, csv_file: str = "nlopt_benchmark_results.csv"):
-        """Parse NLopt benchmark results from CSV"""
-        if not Path(csv_file).exists():
+        """Parse NLopt benchmark results from CSV, merging them into any
+        results already loaded (a repeated test name replaces the old row)"""
+        try:
+            fh = Path(csv_file).open('r', newline='')
+        except FileNotFoundError:
             print(f"Warning: {csv_file} not found. Run NLopt benchmarks first.")
             return
             
-        with open(csv_file, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                test_name = row['TestName']
-                self.nlopt_results[test_name] = {
-                    'time_ms': float(row['ExecutionTime_ms']),
-                    'func_evals': int(row['FunctionEvaluations']),
-                    'final_value': float(row['FinalValue']),
-                    'param_error': float(row['ParameterError']),
-                    'converged': row['Converged'].lower() == 'true',
-                    'algorithm': row['Algorithm']
-                }
+        with fh:
+            source_stat = os.fstat(fh.fileno())
+            cached = _load_cache(csv_file, source_stat, _NLOPT_DTYPES)
+            if cached is not None:
+                self.nlopt_names, self.nlopt_cols = _merge_columns(
+                    self.nlopt_names, self.nlopt_cols, *cached, _NLOPT_DTYPES)
+                self._pair_results()
+                return
+            
+            # polars is optional and slow to import, so only load it when
+            # there is actually a CSV to parse
+            try:
+                import polars as pl
+            except ImportError:
+                pl = None
+            
+            if pl is not None:
+                # Let polars decode and type the columns; fall back to csv below.
+                # It gets the path so its native reader is used; the text handle
+                # only serves the fstat above and the csv fallback.
+                # FinalValue and Algorithm are not used by the report, so they
+                # are kept as raw strings rather than converted.
+                try:
+                    df = pl.read_csv(csv_file, schema_overrides={
+                        'TestName': pl.Utf8,
+                        'Algorithm': pl.Utf8,
+                        'ExecutionTime_ms': pl.Float64,
+                        'FunctionEvaluations': pl.Int64,
+                        'FinalValue': pl.Utf8,
+                        'ParameterError': pl.Float64,
+                        'Converged': pl.Utf8
+                    })
+                except pl.exceptions.NoDataError:
+                    # Empty file (e.g. an aborted benchmark run): no rows, like csv
+                    names, col_lists = [], {}
+                else:
+                    # Blank numeric cells become nulls that would turn into NaN or
+                    # INT64_MIN in NumPy; reject them like float()/int() do below
+                    numeric = ('ExecutionTime_ms', 'FunctionEvaluations', 'ParameterError')
+                    missing = [c for c in numeric if df[c].null_count()]
+                    if missing:
+                        raise ValueError(f"{csv_file}: missing values in column(s) {', '.join(missing)}")
+                    # Blank text cells are empty strings in the csv path
+                    df = df.with_columns(pl.col(pl.Utf8).fill_null('')).unique(
+                        subset='TestName', keep='last', maintain_order=True)
+                    names = df['TestName'].to_list()
+                    col_lists = {
+                        'time_ms': df['ExecutionTime_ms'].to_numpy(),
+                        'func_evals': df['FunctionEvaluations'].to_numpy(),
+                        'final_value': df['FinalValue'].to_list(),
+                        'param_error': df['ParameterError'].to_numpy(),
+                        'converged': (df['Converged'].str.to_lowercase() == 'true').to_numpy(),
+                        'algorithm': df['Algorithm'].to_list()
+                    }
+            else:
+                names, col_lists = [], {k: [] for k in _NLOPT_DTYPES}
+                rows = {}
+                for row in csv.DictReader(fh):
+                    values = {
+                        'time_ms': float(row['ExecutionTime_ms']),
+                        'func_evals': int(row['FunctionEvaluations']),
+                        'final_value': row['FinalValue'],
+                        'param_error': float(row['ParameterError']),
+                        'converged': row['Converged'].lower() == 'true',
+                        'algorithm': row['Algorithm']
+                    }
+                    _append_row(names, col_lists, rows, row['TestName'], values)
+        
+        new_names = np.asarray(names, dtype=str)
+        new_cols = _to_columns(col_lists, _NLOPT_DTYPES)
+        _save_cache(csv_file, source_stat, new_names, new_cols)
+        self.nlopt_names, self.nlopt_cols = _merge_columns(
+            self.nlopt_names, self.nlopt_cols, new_names, new_cols, _NLOPT_DTYPES)
+        self._pair_results()
     
     def parse_csharp_output(self, output_file: str = "csharp_results.txt"):
-        """Parse C# benchmark output"""
-        if not Path(output_file).exists():
+        """Parse C# benchmark output, merging it into any results already
+        loaded (a repeated test/variant replaces the old row)"""
+        try:
+            fh = Path(output_file).open('r')
+        except FileNotFoundError:
             print(f"Warning: {output_file} not found. Run C# benchmarks first.")
             return
             
-        with open(output_file, 'r') as f:
-            content = f.read()
-        
-        # Parse the detailed results table
-        pattern = r'(\w+)\s+(Ours \(\w+\)|\w+ \(\w+\))\s+([\d.]+)\s+(\d+)\s+(\d+)\s+([\d.E+-]+)\s+(\w+)'
-        matches = re.findall(pattern, content)
-        
-        for match in matches:
-            test_name, implementation, time_ms, iterations, func_evals, param_error, status = match
+        with fh:
+            source_stat = os.fstat(fh.fileno())
+            cached = _load_cache(output_file, source_stat, _CSHARP_DTYPES)
+            if cached is not None:
+                self.csharp_names, self.csharp_cols = _merge_columns(
+                    self.csharp_names, self.csharp_cols, *cached, _CSHARP_DTYPES)
+                self._pair_results()
+                return
             
-            if implementation.startswith('Ours'):
-                variant = 'Standard' if 'Standard' in implementation else 'Optimized'
-                key = f"{test_name}_{variant}"
+            # Parse the detailed results table, one line at a time
+            names, col_lists = [], {k: [] for k in _CSHARP_DTYPES}
+            rows = {}
+            for line in fh:
+                m = _ROW_RE.match(line)
+                if not m:
+                    continue
+                test_name, implementation, time_ms, iterations, func_evals, param_error, status = m.groups()
                 
-                self.csharp_results[key] = {
-                    'time_ms': float(time_ms),
-                    'func_evals': int(func_evals),
-                    'iterations': int(iterations),
-                    'param_error': float(param_error),
-                    'converged': status == 'CONVERGED',
-                    'implementation': implementation
-                }
+                if implementation.startswith('Ours'):
+                    variant = 'Standard' if 'Standard' in implementation else 'Optimized'
+                    key = f"{test_name}_{variant}"
+                    
+                    values = {
+                        'time_ms': float(time_ms),
+                        'func_evals': int(func_evals),
+                        'iterations': int(iterations),
+                        'param_error': float(param_error),
+                        'converged': status == 'CONVERGED',
+                        'implementation': implementation
+                    }
+                    _append_row(names, col_lists, rows, key, values)
+        
+        new_names = np.asarray(names, dtype=str)
+        new_cols = _to_columns(col_lists, _CSHARP_DTYPES)
+        _save_cache(output_file, source_stat, new_names, new_cols)
+        self.csharp_names, self.csharp_cols = _merge_columns(
+            self.csharp_names, self.csharp_cols, new_names, new_cols, _CSHARP_DTYPES)
+        self._pair_results()
+    
+    def _pair_results(self):
+        """Find the tests shared with NLopt for each C# variant and the row
+        indices of their entries in the column arrays"""
+        nlopt_rows = {t: i for i, t in enumerate(self.nlopt_names.tolist())}
+        std_rows, opt_rows = {}, {}
+        for i, k in enumerate(self.csharp_names.tolist()):
+            if k.endswith('_Standard'):
+                std_rows[k[:-9]] = i
+            elif k.endswith('_Optimized'):
+                opt_rows[k[:-10]] = i
+        self.common_std = sorted(nlopt_rows.keys() & std_rows.keys())
+        self.common_opt = sorted(nlopt_rows.keys() & opt_rows.keys())
+        # (NLopt rows, C# Standard rows, C# Optimized rows or -1 if missing)
+        self._std_rows = (
+            np.array([nlopt_rows[t] for t in self.common_std], dtype=np.intp),
+            np.array([std_rows[t] for t in self.common_std], dtype=np.intp),
+            np.array([opt_rows.get(t, -1) for t in self.common_std], dtype=np.intp)
+        )
+        # (NLopt rows, C# Optimized rows)
+        self._opt_rows = (
+            np.array([nlopt_rows[t] for t in self.common_opt], dtype=np.intp),
+            np.array([opt_rows[t] for t in self.common_opt], dtype=np.intp)
+        )
     
-    def generate_comparison_report(self):
-        """Generate comprehensive comparison report"""
+    def generate_comparison_report(self, out=None):
+        """Generate comprehensive comparison report
+        
+        When an open text file is passed as ``out`` the report is streamed
+        into it line by line and None is returned; otherwise the report is
+        returned as a string.
+        """
         report = []
-        report.append("# Real NLopt vs C# Performance Comparison")
-        report.append("=" * 50)
-        report.append("")
+        if out is None:
+            emit = report.append
+        else:
+            def emit(line):
+                out.write(line + "\n")
+        
+        # Check if we have data before building anything else
+        if not self.nlopt_names.size or not self.csharp_names.size:
+            emit("⚠️  **Incomplete Data**")
+            emit("")
+            if not self.nlopt_names.size:
+                emit("- NLopt results missing. Install NLopt and run: `make nlopt_benchmark && ./nlopt_benchmark`")
+            if not self.csharp_names.size:
+                emit("- C# results missing. Run: `dotnet run perf > Benchmarks/csharp_results.txt`")
+            emit("")
+            return "\n".join(report) if out is None else None
         
-        # Check if we have data
-        if not self.nlopt_results or not self.csharp_results:
-            report.append("⚠️  **Incomplete Data**")
-            report.append("")
-            if not self.nlopt_results:
-                report.append("- NLopt results missing. Install NLopt and run: `make nlopt_benchmark && ./nlopt_benchmark`")
-            if not self.csharp_results:
-                report.append("- C# results missing. Run: `dotnet run perf > Benchmarks/csharp_results.txt`")
-            report.append("")
-            return "\n".join(report)
+        emit("# Real NLopt vs C# Performance Comparison")
+        emit("=" * 50)
+        emit("")
         
         # Performance comparison table
-        report.append("## Performance Comparison Results")
-        report.append("")
-        report.append("| Test Function | NLopt Time(ms) | C# Std Time(ms) | C# Opt Time(ms) | Speedup Ratio | Accuracy Comparison |")
-        report.append("|---------------|----------------|-----------------|-----------------|---------------|---------------------|")
+        emit("## Performance Comparison Results")
+        emit("")
+        emit("| Test Function | NLopt Time(ms) | C# Std Time(ms) | C# Opt Time(ms) | Speedup Ratio | Accuracy Comparison |")
+        emit("|---------------|----------------|-----------------|-----------------|---------------|---------------------|")
         
-        common_tests = set()
-        for nlopt_test in self.nlopt_results.keys():
-            if f"{nlopt_test}_Standard" in self.csharp_results:
-                common_tests.add(nlopt_test)
+        tests = self.common_std
+        nlopt_idx, std_idx, opt_idx = self._std_rows
+        csharp_all_times = self.csharp_cols['time_ms']
+        nlopt_times = self.nlopt_cols['time_ms'][nlopt_idx]
+        std_times = csharp_all_times[std_idx]
+        opt_times = np.where(opt_idx >= 0, csharp_all_times[opt_idx], np.nan)
+        nlopt_errs = self.nlopt_cols['param_error'][nlopt_idx]
+        csharp_errs = self.csharp_cols['param_error'][std_idx]
         
-        total_nlopt_time = 0
-        total_csharp_std_time = 0
-        total_csharp_opt_time = 0
+        total_nlopt_time = nlopt_times.sum()
+        total_csharp_std_time = np.nansum(std_times)
+        total_csharp_opt_time = np.nansum(opt_times)
         
-        for test in sorted(common_tests):
-            nlopt = self.nlopt_results[test]
-            csharp_std = self.csharp_results.get(f"{test}_Standard", {})
-            csharp_opt = self.csharp_results.get(f"{test}_Optimized", {})
-            
-            nlopt_time = nlopt['time_ms']
-            csharp_std_time = csharp_std.get('time_ms', float('nan'))
-            csharp_opt_time = csharp_opt.get('time_ms', float('nan'))
-            
-            total_nlopt_time += nlopt_time
-            total_csharp_std_time += csharp_std_time if not np.isnan(csharp_std_time) else 0
-            total_csharp_opt_time += csharp_opt_time if not np.isnan(csharp_opt_time) else 0
-            
-            # Calculate speedup ratios
-            std_ratio = nlopt_time / csharp_std_time if not np.isnan(csharp_std_time) and csharp_std_time > 0 else float('nan')
-            opt_ratio = nlopt_time / csharp_opt_time if not np.isnan(csharp_opt_time) and csharp_opt_time > 0 else float('nan')
-            
-            # Accuracy comparison
-            nlopt_error = nlopt['param_error']
-            csharp_error = csharp_std.get('param_error', float('nan'))
-            acc_ratio = nlopt_error / csharp_error if not np.isnan(csharp_error) and csharp_error > 0 else float('nan')
-            
-            report.append(f"| {test:<13} | {nlopt_time:>13.1f} | {csharp_std_time:>14.1f} | {csharp_opt_time:>14.1f} | {opt_ratio:>12.2f}x | {acc_ratio:>18.2f}x |")
+        # Calculate speedup and accuracy ratios (NaN where C# data is missing or zero)
+        opt_ratio = np.divide(nlopt_times, opt_times, out=np.full_like(nlopt_times, np.nan), where=opt_times > 0)
+        acc_ratio = np.divide(nlopt_errs, csharp_errs, out=np.full_like(nlopt_errs, np.nan), where=csharp_errs > 0)
+        
+        for test, nlopt_time, csharp_std_time, csharp_opt_time, opt_r, acc_r in zip(
+                tests, nlopt_times, std_times, opt_times, opt_ratio, acc_ratio):
+            emit(f"| {test:<13} | {nlopt_time:>13.1f} | {csharp_std_time:>14.1f} | {csharp_opt_time:>14.1f} | {opt_r:>12.2f}x | {acc_r:>18.2f}x |")
         
         # Summary statistics
         overall_std_ratio = total_nlopt_time / total_csharp_std_time if total_csharp_std_time > 0 else float('nan')
         overall_opt_ratio = total_nlopt_time / total_csharp_opt_time if total_csharp_opt_time > 0 else float('nan')
         
-        report.append("")
-        report.append("## Summary Statistics")
-        report.append("")
-        report.append(f"**Overall Performance Ratios** (NLopt time / C# time):")
-        report.append(f"- C# Standard: {overall_std_ratio:.2f}x (NLopt is {1/overall_std_ratio:.1f}x faster)" if not np.isnan(overall_std_ratio) else "- C# Standard: Data unavailable")
-        report.append(f"- C# Optimized: {overall_opt_ratio:.2f}x (NLopt is {1/overall_opt_ratio:.1f}x faster)" if not np.isnan(overall_opt_ratio) else "- C# Optimized: Data unavailable")
-        report.append("")
+        emit("")
+        emit("## Summary Statistics")
+        emit("")
+        emit(f"**Overall Performance Ratios** (NLopt time / C# time):")
+        emit(f"- C# Standard: {overall_std_ratio:.2f}x (NLopt is {1/overall_std_ratio:.1f}x faster)" if not np.isnan(overall_std_ratio) else "- C# Standard: Data unavailable")
+        emit(f"- C# Optimized: {overall_opt_ratio:.2f}x (NLopt is {1/overall_opt_ratio:.1f}x faster)" if not np.isnan(overall_opt_ratio) else "- C# Optimized: Data unavailable")
+        emit("")
         
         # Function evaluation efficiency
-        report.append("## Function Evaluation Efficiency")
-        report.append("")
-        nlopt_total_evals = sum(r['func_evals'] for r in self.nlopt_results.values())
-        csharp_total_evals = sum(r['func_evals'] for r in self.csharp_results.values() if '_Standard' in r)
+        emit("## Function Evaluation Efficiency")
+        emit("")
+        nlopt_total_evals = int(self.nlopt_cols['func_evals'].sum())
+        std_mask = np.char.endswith(self.csharp_names, '_Standard')
+        csharp_total_evals = int(self.csharp_cols['func_evals'][std_mask].sum())
         
         if csharp_total_evals > 0:
             eval_ratio = nlopt_total_evals / csharp_total_evals
-            report.append(f"- NLopt total function evaluations: {nlopt_total_evals:,}")
-            report.append(f"- C# total function evaluations: {csharp_total_evals:,}")
-            report.append(f"- Evaluation efficiency ratio: {eval_ratio:.2f}x")
+            emit(f"- NLopt total function evaluations: {nlopt_total_evals:,}")
+            emit(f"- C# total function evaluations: {csharp_total_evals:,}")
+            emit(f"- Evaluation efficiency ratio: {eval_ratio:.2f}x")
             if eval_ratio < 1.0:
-                report.append(f"  * ✅ C# uses {(1-eval_ratio)*100:.1f}% fewer function evaluations")
+                emit(f"  * ✅ C# uses {(1-eval_ratio)*100:.1f}% fewer function evaluations")
             else:
-                report.append(f"  * ❌ C# uses {(eval_ratio-1)*100:.1f}% more function evaluations")
+                emit(f"  * ❌ C# uses {(eval_ratio-1)*100:.1f}% more function evaluations")
         
-        report.append("")
+        emit("")
         
         # Detailed analysis
-        report.append("## Detailed Analysis")
-        report.append("")
-        
-        fastest_nlopt = []
-        fastest_csharp = []
+        emit("## Detailed Analysis")
+        emit("")
         
-        for test in sorted(common_tests):
-            nlopt = self.nlopt_results[test]
-            csharp_opt = self.csharp_results.get(f"{test}_Optimized", {})
-            
-            if csharp_opt and nlopt['time_ms'] < csharp_opt['time_ms']:
-                fastest_nlopt.append(test)
-            elif csharp_opt and csharp_opt['time_ms'] < nlopt['time_ms']:
-                fastest_csharp.append(test)
+        # Missing optimized results are NaN and compare False on both sides
+        test_names = np.array(tests, dtype=object)
+        fastest_nlopt = test_names[nlopt_times < opt_times].tolist()
+        fastest_csharp = test_names[opt_times < nlopt_times].tolist()
         
         if fastest_nlopt:
-            report.append(f"**NLopt Faster On**: {', '.join(fastest_nlopt)}")
+            emit(f"**NLopt Faster On**: {', '.join(fastest_nlopt)}")
         if fastest_csharp:
-            report.append(f"**C# Faster On**: {', '.join(fastest_csharp)}")
+            emit(f"**C# Faster On**: {', '.join(fastest_csharp)}")
         
-        report.append("")
-        report.append("## Key Findings")
-        report.append("")
+        emit("")
+        emit("## Key Findings")
+        emit("")
         
         if not np.isnan(overall_opt_ratio):
             if overall_opt_ratio > 0.8:
-                report.append("✅ **Competitive Performance**: C# optimized version achieves >80% of NLopt performance")
+                emit("✅ **Competitive Performance**: C# optimized version achieves >80% of NLopt performance")
             elif overall_opt_ratio > 0.5:
-                report.append("⚠️  **Reasonable Performance**: C# achieves 50-80% of NLopt performance")
+                emit("⚠️  **Reasonable Performance**: C# achieves 50-80% of NLopt performance")
             else:
-                report.append("❌ **Performance Gap**: C# significantly slower than NLopt")
+                emit("❌ **Performance Gap**: C# significantly slower than NLopt")
         
         # Hardware and environment info
-        report.append("")
-        report.append("## Test Environment")
-        report.append("")
-        report.append("- **Hardware**: Same system for both benchmarks")
-        report.append("- **NLopt**: Native C++ implementation with Nelder-Mead")
-        report.append("- **C#**: .NET 9.0 JIT-compiled implementation")
-        report.append("- **Compiler**: g++ -O3 -march=native for NLopt")
-        report.append("- **Convergence**: Same tolerance settings (1e-8)")
+        emit("")
+        emit("## Test Environment")
+        emit("")
+        emit("- **Hardware**: Same system for both benchmarks")
+        emit("- **NLopt**: Native C++ implementation with Nelder-Mead")
+        emit("- **C#**: .NET 9.0 JIT-compiled implementation")
+        emit("- **Compiler**: g++ -O3 -march=native for NLopt")
+        emit("- **Convergence**: Same tolerance settings (1e-8)")
         
-        return "\n".join(report)
+        return "\n".join(report) if out is None else None
     
     def create_performance_chart(self):
         """Create performance comparison charts"""
+        common_tests = self.common_std
+        if not common_tests:
+            print("No common tests found for charting")
+            return
+        
         try:
+            # Charts are only written to disk, so skip GUI backend discovery
+            import matplotlib
+            matplotlib.use('Agg')
             import matplotlib.pyplot as plt
             
-            # Find common tests
-            common_tests = []
-            nlopt_times = []
-            csharp_std_times = []
-            csharp_opt_times = []
-            
-            for nlopt_test in self.nlopt_results.keys():
-                if f"{nlopt_test}_Standard" in self.csharp_results:
-                    common_tests.append(nlopt_test)
-                    nlopt_times.append(self.nlopt_results[nlopt_test]['time_ms'])
-                    csharp_std_times.append(self.csharp_results[f"{nlopt_test}_Standard"]['time_ms'])
-                    
-                    opt_key = f"{nlopt_test}_Optimized"
-                    if opt_key in self.csharp_results:
-                        csharp_opt_times.append(self.csharp_results[opt_key]['time_ms'])
-                    else:
-                        csharp_opt_times.append(csharp_std_times[-1])
-            
-            if not common_tests:
-                print("No common tests found for charting")
-                return
+            # Missing optimized results fall back to the standard timing
+            nlopt_idx, std_idx, opt_idx = self._std_rows
+            nlopt_times = self.nlopt_cols['time_ms'][nlopt_idx]
+            csharp_std_times = self.csharp_cols['time_ms'][std_idx]
+            csharp_opt_times = np.where(opt_idx >= 0, self.csharp_cols['time_ms'][opt_idx], csharp_std_times)
             
             # Create bar chart
             x = np.arange(len(common_tests))
@@ -242,21 +459,12 @@ class PerformanceAnalyzer:
             ax.set_yscale('log')  # Log scale for better visualization
             
             # Add value labels on bars
-            def add_labels(bars):
-                for bar in bars:
-                    height = bar.get_height()
-                    ax.annotate(f'{height:.1f}',
-                               xy=(bar.get_x() + bar.get_width() / 2, height),
-                               xytext=(0, 3),
-                               textcoords="offset points",
-                               ha='center', va='bottom', fontsize=8)
-            
-            add_labels(bars1)
-            add_labels(bars2)
-            add_labels(bars3)
+            for bars in (bars1, bars2, bars3):
+                ax.bar_label(bars, fmt='%.1f', padding=3, fontsize=8)
             
             plt.tight_layout()
-            plt.savefig('performance_comparison.png', dpi=300, bbox_inches='tight')
+            plt.savefig('performance_comparison.png', dpi=150, bbox_inches='tight',
+                        pil_kwargs={'compress_level': 1})
             plt.close()
             
             print("📊 Performance chart saved as performance_comparison.png")
@@ -264,47 +472,49 @@ class PerformanceAnalyzer:
         except ImportError:
             print("Matplotlib not available. Install with: pip install matplotlib")
     
-    def run_analysis(self):
+    def run_analysis(self, create_chart: bool = True):
         """Run complete analysis"""
         print("🔍 Analyzing benchmark results...")
         
         self.parse_nlopt_csv()
         self.parse_csharp_output()
         
-        # Generate report
-        report = self.generate_comparison_report()
-        
-        # Save report
-        with open('REAL_PERFORMANCE_COMPARISON.md', 'w') as f:
-            f.write(report)
+        # Stream the report into a temporary file next to the output and
+        # only replace the previous report once it has been fully written
+        report_file = 'REAL_PERFORMANCE_COMPARISON.md'
+        tmp_file = report_file + '.tmp'
+        try:
+            with open(tmp_file, 'w') as f:
+                self.generate_comparison_report(out=f)
+            os.replace(tmp_file, report_file)
+        except BaseException:
+            Path(tmp_file).unlink(missing_ok=True)
+            raise
         
         print("📝 Analysis complete!")
         print("📄 Report saved as: REAL_PERFORMANCE_COMPARISON.md")
         
         # Create chart if possible
-        self.create_performance_chart()
+        if create_chart:
+            self.create_performance_chart()
         
         # Print summary to console
         print("\n" + "="*60)
         print("QUICK SUMMARY")
         print("="*60)
         
-        if self.nlopt_results and self.csharp_results:
+        if self.nlopt_names.size and self.csharp_names.size:
             # Calculate quick stats
-            common_tests = set()
-            for nlopt_test in self.nlopt_results.keys():
-                if f"{nlopt_test}_Optimized" in self.csharp_results:
-                    common_tests.add(nlopt_test)
+            common_tests = self.common_opt
             
             if common_tests:
-                ratios = []
-                for test in common_tests:
-                    nlopt_time = self.nlopt_results[test]['time_ms']
-                    csharp_time = self.csharp_results[f"{test}_Optimized"]['time_ms']
-                    if csharp_time > 0:
-                        ratios.append(nlopt_time / csharp_time)
+                nlopt_idx, opt_idx = self._opt_rows
+                nlopt_times = self.nlopt_cols['time_ms'][nlopt_idx]
+                csharp_times = self.csharp_cols['time_ms'][opt_idx]
+                valid = csharp_times > 0
+                ratios = nlopt_times[valid] / csharp_times[valid]
                 
-                if ratios:
+                if ratios.size:
                     avg_ratio = np.mean(ratios)
                     print(f"✅ Tested {len(common_tests)} functions on same hardware")
                     print(f"📊 C# Optimized achieves {avg_ratio:.1%} of NLopt performance")
@@ -315,11 +525,16 @@ class PerformanceAnalyzer:
                 print("❌ No matching test cases found")
         else:
             print("❌ Incomplete benchmark data")
-            if not self.nlopt_results:
+            if not self.nlopt_names.size:
                 print("   Missing NLopt results - run: make install_nlopt && make nlopt_benchmark && ./nlopt_benchmark")
-            if not self.csharp_results:
+            if not self.csharp_names.size:
                 print("   Missing C# results - run: dotnet run perf > Benchmarks/csharp_results.txt")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare NLopt and C# benchmark results")
+    parser.add_argument('--no-chart', action='store_true',
+                        help="skip generating performance_comparison.png (e.g. for CI runs)")
+    args = parser.parse_args()
+    
     analyzer = PerformanceAnalyzer()
-    analyzer.run_analysis()
\ No newline at end of file
+    analyzer.run_analysis(create_chart=not args.no_chart)
\ No newline at end of file